@@ -1,4 +1,5 @@
-﻿import importlib
+﻿import functools
+import importlib
 import os
 import re
 import sys
@@ -13,29 +14,49 @@ NODE_DISPLAY_NAME_MAPPINGS = {
 }
 
 
+_PRETTY_RE = re.compile(r"[A-Z]+[a-z]*|[a-z]+")
+
+
 # noinspection PyShadowingNames
+@functools.lru_cache(maxsize=None)
 def pretty(name:str):
-    return " ".join(re.findall("[A-Z]*[a-z]*", name))
-
-for module in [os.path.splitext(f)[0] for f in os.listdir(module_root_directory) if f.endswith('.py') and not f.startswith('_')]:
-    imported_module = importlib.import_module(f"{module}")
-    # Legacy pattern: modules export a list 'CLAZZES' of node classes
-    if 'CLAZZES' in imported_module.__dict__:
-        for clazz in imported_module.CLAZZES:
-            name = clazz.__name__
-            NODE_CLASS_MAPPINGS[name] = clazz
-            display_name = getattr(clazz, "NAME", None)
-            if isinstance(display_name, str) and display_name.strip():
-                NODE_DISPLAY_NAME_MAPPINGS[name] = display_name
-            else:
-                NODE_DISPLAY_NAME_MAPPINGS[name] = pretty(name)
-    # Autonode pattern: modules export CLASS_MAPPINGS and CLASS_NAMES
-    elif 'CLASS_MAPPINGS' in imported_module.__dict__ and 'CLASS_NAMES' in imported_module.__dict__:
-        for name, clazz in imported_module.CLASS_MAPPINGS.items():
-            NODE_CLASS_MAPPINGS[name] = clazz
-        for name, display_name in imported_module.CLASS_NAMES.items():
-            # Use provided custom name if present, otherwise pretty name
-            NODE_DISPLAY_NAME_MAPPINGS[name] = display_name or pretty(name)
+    return " ".join(_PRETTY_RE.findall(name))
+
+# Prefer the manifest generated by tools/build_manifest.py; it names the modules to import and
+# the nodes each registers, so no directory scan or module reflection is needed here.
+try:
+    from ._node_manifest import MODULES, NODE_MANIFEST
+except ImportError:
+    MODULES = NODE_MANIFEST = None
+
+if MODULES is not None:
+    imported_modules = {module: importlib.import_module(module) for module in MODULES}
+    for module, name, display_name in NODE_MANIFEST:
+        imported_module = imported_modules[module]
+        class_mappings = imported_module.__dict__.get('CLASS_MAPPINGS')
+        NODE_CLASS_MAPPINGS[name] = class_mappings[name] if class_mappings is not None else getattr(imported_module, name)
+        NODE_DISPLAY_NAME_MAPPINGS[name] = display_name or pretty(name)
+else:
+    # Dev fallback when the manifest hasn't been generated: scan and reflect over every module
+    for module in [os.path.splitext(f)[0] for f in os.listdir(module_root_directory) if f.endswith('.py') and not f.startswith('_')]:
+        imported_module = importlib.import_module(f"{module}")
+        # Legacy pattern: modules export a list 'CLAZZES' of node classes
+        if 'CLAZZES' in imported_module.__dict__:
+            for clazz in imported_module.CLAZZES:
+                name = clazz.__name__
+                NODE_CLASS_MAPPINGS[name] = clazz
+                display_name = getattr(clazz, "NAME", None)
+                if isinstance(display_name, str) and display_name.strip():
+                    NODE_DISPLAY_NAME_MAPPINGS[name] = display_name
+                else:
+                    NODE_DISPLAY_NAME_MAPPINGS[name] = pretty(name)
+        # Autonode pattern: modules export CLASS_MAPPINGS and CLASS_NAMES
+        elif 'CLASS_MAPPINGS' in imported_module.__dict__ and 'CLASS_NAMES' in imported_module.__dict__:
+            for name, clazz in imported_module.CLASS_MAPPINGS.items():
+                NODE_CLASS_MAPPINGS[name] = clazz
+            for name, display_name in imported_module.CLASS_NAMES.items():
+                # Use provided custom name if present, otherwise pretty name
+                NODE_DISPLAY_NAME_MAPPINGS[name] = display_name or pretty(name)
 
 WEB_DIRECTORY = "./js"
 __all__ = ['NODE_CLASS_MAPPINGS', 'NODE_DISPLAY_NAME_MAPPINGS', 'WEB_DIRECTORY']
@@ -0,0 +1,57 @@
+# Helpers shared by the static file routes in _mini_webserver.py and spotlight_routes.py.
+# Imported by its top-level name (the package __init__ puts this directory on sys.path), so
+# both modules get the same copy.
+
+from __future__ import annotations
+
+import os
+import stat
+from pathlib import Path, PurePath
+from typing import Optional
+
+try:
+    # orjson serializes straight to bytes and is considerably faster for large listings
+    import orjson  # type: ignore
+
+    def json_bytes(obj) -> bytes:
+        return orjson.dumps(obj)
+except ImportError:  # pragma: no cover - stdlib fallback
+    import json
+
+    def json_bytes(obj) -> bytes:
+        return json.dumps(obj).encode("utf-8")
+
+# Read size for FileResponse's fallback path, used only when loop.sendfile() isn't available
+# (TLS transports, compressed responses, AIOHTTP_NOSENDFILE); aiohttp calls loop.sendfile()
+# whenever it can, whatever chunk_size is, so this does not make sendfile more likely
+FILE_CHUNK_SIZE = 256 * 1024
+
+
+def safe_join(base: Path, tail: str) -> Optional[Path]:
+    """
+    Join a request tail onto base (already resolved) without resolving the result. Returns
+    None if any component is '..', absolute, contains a backslash or a ':' (a Windows drive
+    such as 'C:', which would re-root the join), if an existing component is a symlink
+    (checked with lstat, before anything could follow it), or if the joined path is somehow
+    not under base. Components past the first missing one are left unchecked; the handler
+    404s those.
+    """
+    parts = Path(tail).parts
+    if any(p == '..' or p.startswith('/') or '\\' in p or ':' in p or PurePath(p).anchor for p in parts):
+        return None
+    cur = base
+    for part in parts:
+        cur = cur / part
+        try:
+            if stat.S_ISLNK(os.lstat(cur).st_mode):
+                return None
+        except OSError:
+            break
+    target = base.joinpath(*parts)
+    # Last line of defence: the filter above should make this unreachable on every platform
+    try:
+        if os.path.commonpath((base, target)) != str(base):
+            return None
+    except ValueError:  # e.g. different drives on Windows
+        return None
+    return target
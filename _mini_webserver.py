@@ -3,20 +3,24 @@
 
 from __future__ import annotations
 
+import asyncio
 import html
 import mimetypes
+import os
 import posixpath
 from pathlib import Path
 
 # noinspection PyPackageRequirements
 from aiohttp import web
-from markdown_it import MarkdownIt
 # noinspection PyUnresolvedReferences,PyPackageRequirements
 from server import PromptServer
 
+from _http_common import FILE_CHUNK_SIZE, json_bytes, safe_join
+
 # Base directory for serving
 MODULE_DIR = Path(__file__).resolve().parent
-WEB_DIR = MODULE_DIR / "web"
+# Resolved once here so per-request sandbox checks need no further resolve() calls
+WEB_DIR = (MODULE_DIR / "web").resolve()
 NODE_MODULES_DIR = (MODULE_DIR / "web/dist/node_modules").resolve()
 
 # Ensure mimetypes has some common types on Windows
@@ -24,21 +28,26 @@ mimetypes.add_type("text/markdown", ".md")
 mimetypes.add_type("text/css", ".css")
 mimetypes.add_type("application/javascript", ".js")
 
+# Shared markdown_it.MarkdownIt renderer, built by _get_md() on the first README request
+_MD = None
 
-def _is_subpath(child: Path, parent: Path) -> bool:
-    try:
-        child.resolve().relative_to(parent.resolve())
-        return True
-    except Exception:
-        return False
+
+def _get_md():
+    global _MD
+    if _MD is None:
+        # Imported here since it is only needed when a directory has a README, and is
+        # costly to import at startup
+        from markdown_it import MarkdownIt
+        md = MarkdownIt("commonmark", {"linkify": True, "typographer": True})
+        md.enable("table")
+        md.enable("strikethrough")
+        _MD = md
+    return _MD
 
 
 def _markdown_to_html(md_text: str) -> str:
     # Render Markdown using markdown-it-py with GFM-like features
-    md = MarkdownIt("commonmark", {"linkify": True, "typographer": True})
-    md.enable("table")
-    md.enable("strikethrough")
-    body = md.render(md_text)
+    body = _get_md().render(md_text)
     return f"""
 <!doctype html>
 <html lang="en"><head>
@@ -53,18 +62,27 @@ def _markdown_to_html(md_text: str) -> str:
 """
 
 
-def _directory_listing(base_url: str, directory: Path, rel: Path) -> web.Response:
-    items = []
+def _directory_listing(request: web.Request, base_url: str, directory: Path, rel: Path) -> web.Response:
     try:
-        for entry in sorted(directory.iterdir(), key=lambda p: (p.is_file(), p.name.lower())):
-            name = entry.name + ("/" if entry.is_dir() else "")
-            link = posixpath.join(base_url.rstrip('/'), *(rel.parts + (entry.name,)))
-            items.append(f"<li><a href='{html.escape(link)}'>{html.escape(name)}</a></li>")
+        # One scandir pass; DirEntry caches the type so sorting and labelling need no extra stats
+        with os.scandir(directory) as it:
+            entries = [(not e.is_dir(), e.name) for e in it]
+        entries.sort(key=lambda e: (e[0], e[1].lower()))
+        error = None
     except Exception as e:
-        items.append(f"<li>Error reading directory: {html.escape(str(e))}</li>")
-    escaped_rel = html.escape(str(rel).replace('\\', '/'))
-    items_html = "\n" + "\n".join(items)
-    body = f"""
+        entries, error = [], e
+
+    # Machine-readable listing for clients that ask for it: ["file.js", "subdir/", ...]
+    if "application/json" in request.headers.get("Accept", ""):
+        if error is not None:
+            return web.Response(body=json_bytes({"error": True, "message": str(error)}), status=500,
+                                content_type="application/json")
+        names = [name if is_file else name + "/" for is_file, name in entries]
+        return web.Response(body=json_bytes(names), content_type="application/json")
+
+    quote = html.escape
+    escaped_rel = quote(str(rel).replace('\\', '/'))
+    buf = bytearray(f"""
 <!doctype html>
 <html lang="en"><head>
 <meta charset='utf-8'><meta name="viewport" content="width=device-width, initial-scale=1">
@@ -73,18 +91,37 @@ def _directory_listing(base_url: str, directory: Path, rel: Path) -> web.Respons
 </head><body>
 <h1>Index of /{escaped_rel}</h1>
 <ul>
-{items_html}
-</ul>
+""".encode())
+    append = buf.extend
+    prefix = posixpath.join(base_url.rstrip('/'), *rel.parts)
+    for is_file, entry_name in entries:
+        link = posixpath.join(prefix, entry_name)
+        name = entry_name if is_file else entry_name + "/"
+        append(f"<li><a href='{quote(link)}'>{quote(name)}</a></li>\n".encode())
+    if error is not None:
+        append(f"<li>Error reading directory: {quote(str(error))}</li>\n".encode())
+    append(b"""</ul>
 </body></html>
-"""
-    return web.Response(text=body, content_type="text/html")
+""")
+    return web.Response(body=bytes(buf), content_type="text/html", charset="utf-8")
 
 
-def _serve_static_files(tail: str, base_dir: Path, base_url: str) -> web.Response:
+def _file_response(path: Path) -> web.FileResponse:
+    """
+    FileResponse that browsers revalidate on every use (no-cache), so edited assets are picked
+    up at once while unchanged ones cost only a 304. aiohttp (>= 3.10.6) already sends an
+    mtime/size ETag and answers If-None-Match, weak and list forms included, without opening
+    the file.
+    """
+    return web.FileResponse(path=path, chunk_size=FILE_CHUNK_SIZE, headers={"Cache-Control": "no-cache"})
+
+
+async def _serve_static_files(request: web.Request, tail: str, base_dir: Path, base_url: str) -> web.StreamResponse:
     """
     Generic static file server for serving files from a base directory.
 
     Args:
+        request: The incoming request (its Accept header selects a JSON directory listing)
         tail: The requested path (may be empty)
         base_dir: The base directory to serve files from
         base_url: The URL prefix for this route (e.g., '/ovum-spotlight/web')
@@ -92,12 +129,9 @@ def _serve_static_files(tail: str, base_dir: Path, base_url: str) -> web.Respons
     Returns:
         A web.Response object
     """
-    # Normalize to Path using POSIX-style incoming paths; prevent traversal
-    safe_tail = Path(*(p for p in Path(tail).parts if p not in ("..","") ))
-    target = (base_dir / safe_tail).resolve()
-
-    # Enforce sandbox under base_dir
-    if not _is_subpath(target, base_dir):
+    # Enforce sandbox under base_dir: no traversal, no symlinks out of it
+    target = safe_join(base_dir, tail)
+    if target is None:
         return web.Response(status=403, text="Forbidden")
 
     # If target is directory, attempt index.html or readme.md
@@ -106,27 +140,28 @@ def _serve_static_files(tail: str, base_dir: Path, base_url: str) -> web.Respons
         readme_md = target / 'readme.md'
         readme_MD = target / 'README.md'
         if index_html.is_file():
-            return web.FileResponse(path=index_html)
+            return _file_response(index_html)
         if readme_md.is_file() or readme_MD.is_file():
             p = readme_md if readme_md.is_file() else readme_MD
+            # Read and render off the event loop so a large README doesn't stall other requests
             try:
-                text = p.read_text(encoding='utf-8', errors='ignore')
+                text = await asyncio.to_thread(p.read_text, encoding='utf-8', errors='ignore')
             except Exception:
-                text = p.read_text(errors='ignore')
-            html_doc = _markdown_to_html(text)
+                text = await asyncio.to_thread(p.read_text, errors='ignore')
+            html_doc = await asyncio.to_thread(_markdown_to_html, text)
             return web.Response(text=html_doc, content_type='text/html')
         # else show directory listing
         rel = target.relative_to(base_dir)
-        return _directory_listing(base_url, target, rel)
+        return _directory_listing(request, base_url, target, rel)
 
     # If file, serve file or 404
     if target.is_file():
-        # FileResponse sets content-type using mimetypes
-        return web.FileResponse(path=target)
+        # FileResponse sets content-type using mimetypes, plus Content-Length and Last-Modified
+        return _file_response(target)
 
     # If path didn't exist but tail is empty (i.e., root), treat as directory listing
     if tail.strip() == "":
-        return _directory_listing(base_url, base_dir, Path('.'))
+        return _directory_listing(request, base_url, base_dir, Path('.'))
 
     return web.Response(status=404, text="Not Found")
 
@@ -134,14 +169,14 @@ def _serve_static_files(tail: str, base_dir: Path, base_url: str) -> web.Respons
 @PromptServer.instance.routes.get('/ovum-spotlight/web/{tail:.*}')
 async def ovum_web(request: web.Request):
     tail = request.match_info.get('tail', '')
-    return _serve_static_files(tail, WEB_DIR, '/ovum-spotlight/web')
+    return await _serve_static_files(request, tail, WEB_DIR, '/ovum-spotlight/web')
 
 
 # /ovum-spotlight/node_modules/fzf/dist/
 @PromptServer.instance.routes.get('/ovum-spotlight/node_modules/{tail:.*}')
 async def ovum_node_modules(request: web.Request):
     tail = request.match_info.get('tail', '')
-    return _serve_static_files(tail, NODE_MODULES_DIR, '/ovum-spotlight/web/dist/node_modules')
+    return await _serve_static_files(request, tail, NODE_MODULES_DIR, '/ovum-spotlight/web/dist/node_modules')
 
 
 
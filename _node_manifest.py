@@ -0,0 +1,14 @@
+# Generated by tools/build_manifest.py -- do not edit by hand.
+# MODULES: imported in order by __init__.py.
+# NODE_MANIFEST: (module, node_name, display_name); a display_name of None means pretty(node_name).
+
+MODULES = (
+    'common_types',
+    'setup_user_plugins',
+    'spotlight_routes',
+    'spotlight_sample_node',
+)
+
+NODE_MANIFEST = (
+    ('spotlight_sample_node', 'SpotlightSampleNode', 'Spotlight Sample Node'),
+)
@@ -1,3 +1,4 @@
+import functools
 import re
 from comfy.comfy_types.node_typing import IO
 
@@ -29,6 +30,12 @@ class ByPassTypeTuple(tuple):
         return item
 
 
+@functools.lru_cache(maxsize=1024)
+def _type_parts(s: str) -> frozenset:
+    """Comma-separated type names as a set; cached since ComfyUI compares the same types repeatedly."""
+    return frozenset(s.split(","))
+
+
 # noinspection DuplicatedCode
 class MultiType(str):
     def __ne__(self, value: object) -> bool:
@@ -36,13 +43,15 @@ class MultiType(str):
             return False
         if not isinstance(value, str):
             return True
-        a = frozenset(self.split(","))
-        b = frozenset(value.split(","))
-        return not (b.issubset(a) or a.issubset(b))
+        a = _type_parts(self)
+        b = _type_parts(value)
+        return not (b <= a or a <= b)
 
 
 ANYTYPE = AnyType("*")
 
+_INT_RE = re.compile(r"[+-]?\d+")
+
 
 def _parse_optional_int(value, field_name: str):
     """Parse optional integer from a widget string.
@@ -55,8 +64,8 @@ def _parse_optional_int(value, field_name: str):
         if len(value) != 1:
             raise ValueError(f"{field_name} must be a single integer, got list of length {len(value)}.")
         value = value[0]
-    # Explicitly reject booleans (bool is subclass of int)
-    if isinstance(value, bool):
+    # Explicitly reject booleans (bool is subclass of int, and cannot itself be subclassed)
+    if type(value) is bool:
         raise ValueError(f"{field_name} must be an integer (blank for unset), got type {type(value)}.")
     if isinstance(value, int):
         return value
@@ -64,7 +73,8 @@ def _parse_optional_int(value, field_name: str):
         s = value.strip()
         if s == "":
             return None
-        if re.fullmatch(r"[+-]?\d+", s):
+        # Unsigned is the common case; isdecimal() accepts exactly what \d does
+        if s.isdecimal() or _INT_RE.fullmatch(s):
             return int(s)
         raise ValueError(f"{field_name} must be an integer (blank for unset), got '{value}'.")
     # Reject floats and other types
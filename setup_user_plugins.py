@@ -1,24 +1,30 @@
 from __future__ import annotations
 
+import contextlib
 import filecmp
+import functools
+import hashlib
+import itertools
+import json
 import logging
 import os
+import re
+import threading
+from concurrent.futures import ThreadPoolExecutor
 from pathlib import Path
-from typing import Dict, Iterable, List, Tuple
+from typing import Dict, Iterable, List, Optional, Tuple
 
 logger = logging.getLogger(__name__)
 
-try:
-    import folder_paths  # type: ignore
-except Exception:  # pragma: no cover
-    logger.warning("[ovum-spotlight] folder_paths not found, using cwd fallback for user directory")
-
-    class _FolderPaths:
-        @staticmethod
-        def get_user_directory() -> str:
-            return os.path.abspath(os.path.join(os.getcwd(), "user"))
-
-    folder_paths = _FolderPaths()  # type: ignore
+@functools.cache
+def _user_directory() -> Path:
+    """ComfyUI's user directory, importing folder_paths on first use."""
+    try:
+        import folder_paths  # type: ignore
+        return Path(folder_paths.get_user_directory()).resolve()
+    except Exception:  # pragma: no cover
+        logger.warning("[ovum-spotlight] folder_paths not found, using cwd fallback for user directory")
+        return Path(os.path.abspath(os.path.join(os.getcwd(), "user"))).resolve()
 
 
 # Replacement rules applied to the CONTENT of any file that originates from a link: source
@@ -59,37 +65,139 @@ def _read_text_any(p: Path) -> str:
         return p.read_text()
 
 
-def _write_text_any(p: Path, text: str) -> None:
+@contextlib.contextmanager
+def _replacing(dst: Path):
+    """
+    Yields a temporary path beside dst to write to, then moves it over dst with os.replace.
+    The user_plugins routes serve files while the background copy runs, and the copy thread
+    can be killed at exit, so dst must never be seen half-written. The dot prefix keeps the
+    temporary out of user_plugins listings.
+    """
+    tmp = dst.with_name(f".{dst.name}.{os.getpid()}-{threading.get_ident()}.tmp")
     try:
-        p.write_text(text, encoding='utf-8')
-    except Exception:
-        p.write_text(text)
+        yield tmp
+        os.replace(tmp, dst)
+    finally:
+        try:
+            tmp.unlink(missing_ok=True)
+        except OSError:
+            pass
+
+
+def _write_text_any(p: Path, text: str) -> None:
+    with _replacing(p) as tmp:
+        try:
+            tmp.write_text(text, encoding='utf-8')
+        except Exception:
+            tmp.write_text(text)
+
+
+# Leading bytes hashed by _same_file before falling back to a full comparison
+HEAD_BYTES = 64 * 1024
+
+
+def _head_digest(p: Path) -> bytes:
+    with p.open('rb') as f:
+        return hashlib.blake2b(f.read(HEAD_BYTES), digest_size=16).digest()
 
 
 def _same_file(src: Path, dst: Path) -> bool:
     try:
         if not dst.exists():
             return False
-        # Fast path: compare size then fallback to full comparison
-        if src.stat().st_size != dst.stat().st_size:
+        # Fast path: compare size, then a hash of the first HEAD_BYTES; only files longer
+        # than that need the full byte-by-byte comparison
+        size = src.stat().st_size
+        if size != dst.stat().st_size:
+            return False
+        if _head_digest(src) != _head_digest(dst):
             return False
-        return filecmp.cmp(str(src), str(dst), shallow=False)
+        return size <= HEAD_BYTES or filecmp.cmp(str(src), str(dst), shallow=False)
     except Exception:
         return False
 
 
+# Hidden (so the user_plugins listing never picks it up) record of what the last run copied:
+# {dst_rel: [source_path, src_size, src_mtime_ns, dst_size, dst_mtime_ns]}. For a link file
+# source_path is the link target, followed by the digest of the replacement rules its content
+# was transformed with and the link file's own size and mtime.
+MANIFEST_NAME = '.manifest.json'
+
+Manifest = Dict[str, list]
+
+
+def _copy_signature(src: Path, dst: Path) -> Optional[list]:
+    try:
+        s, d = src.stat(), dst.stat()
+    except OSError:
+        return None
+    return [str(src), s.st_size, s.st_mtime_ns, d.st_size, d.st_mtime_ns]
+
+
+def _link_signature(link: Path, target: Path, dst: Path, rules_digest: str) -> Optional[list]:
+    signature = _copy_signature(target, dst)
+    try:
+        st = link.stat()
+    except OSError:
+        return None
+    return None if signature is None else signature + [rules_digest, st.st_size, st.st_mtime_ns]
+
+
+def _unchanged(entry: list, src: Path, dst: Path, rules_digest: str) -> bool:
+    """
+    Whether a recorded manifest entry still holds, using stat() alone. A plain copy's entry
+    starts with src itself; anything else is a link entry, naming the target src links to.
+    """
+    if entry[0] == str(src):
+        return _copy_signature(src, dst) == entry
+    return _link_signature(src, Path(entry[0]), dst, rules_digest) == entry
+
+
+def _replacements_digest(replacements: Dict[str, str]) -> str:
+    # Changing the rules must re-transform link files even when their sources are untouched
+    data = json.dumps(sorted(replacements.items())).encode('utf-8')
+    return hashlib.blake2b(data, digest_size=16).hexdigest()
+
+
+def _load_manifest(base: Path) -> Manifest:
+    try:
+        data = json.loads((base / MANIFEST_NAME).read_text(encoding='utf-8'))
+        return data if isinstance(data, dict) else {}
+    except Exception:
+        return {}
+
+
+def _save_manifest(base: Path, manifest: Manifest) -> None:
+    try:
+        (base / MANIFEST_NAME).write_text(json.dumps(manifest, indent=1, sort_keys=True), encoding='utf-8')
+    except Exception as e:
+        logger.warning("[ovum-spotlight] Failed to write %s: %s", MANIFEST_NAME, e)
+
+
+@functools.lru_cache(maxsize=8)
+def _replacement_pattern(keys: Tuple[str, ...]) -> re.Pattern:
+    # Longest keys first so overlapping rules prefer the most specific match
+    return re.compile('|'.join(re.escape(k) for k in sorted(keys, key=len, reverse=True)))
+
+
 def _apply_replacements(text: str, replacements: Dict[str, str]) -> str:
-    for old, new in replacements.items():
-        text = text.replace(old, new)
-    return text
+    # Single pass over text for all rules; the pattern is rebuilt only when the keys change
+    if not replacements:
+        return text
+    pattern = _replacement_pattern(tuple(replacements))
+    return pattern.sub(lambda m: replacements[m.group(0)], text)
 
 
 def _copy_file_with_compare(src: Path, dst: Path) -> None:
-    dst.parent.mkdir(parents=True, exist_ok=True)
     if _same_file(src, dst):
         return
     data = src.read_bytes()
-    dst.write_bytes(data)
+    with _replacing(dst) as tmp:
+        tmp.write_bytes(data)
+
+
+# Lines read from the top of each default file: the "link:" line and the header block after it
+HEADER_LINES = 10
 
 
 def _extract_headers_and_target(src: Path) -> Tuple[Path, List[str], bool]:
@@ -98,13 +206,14 @@ def _extract_headers_and_target(src: Path) -> Tuple[Path, List[str], bool]:
     If file starts with a line "link:<path>", treat <path> as the source file instead.
     Any subsequent lines at the top that look like "Word: details" will be logged.
     """
+    # Only the header region is read, never the rest of the file
     try:
         with src.open('r', encoding='utf-8') as f:
-            lines = f.read().splitlines()
+            lines = [line.rstrip('\n') for line in itertools.islice(f, HEADER_LINES)]
     except Exception:
         try:
             with src.open('r') as f:
-                lines = f.read().splitlines()
+                lines = [line.rstrip('\n') for line in itertools.islice(f, HEADER_LINES)]
         except Exception:
             return src, [], False
 
@@ -115,7 +224,7 @@ def _extract_headers_and_target(src: Path) -> Tuple[Path, List[str], bool]:
     if first.lower().startswith('link:'):
         # Collect additional header-like lines to log
         extras: List[str] = []
-        for line in lines[1:10]:  # scan a small header region
+        for line in lines[1:]:
             s = line.strip()
             if not s:
                 break
@@ -136,42 +245,73 @@ def _extract_headers_and_target(src: Path) -> Tuple[Path, List[str], bool]:
     return src, [], False
 
 
-def _copy_tree_with_links(src_root: Path, dst_root: Path) -> None:
-    for src in _iter_files(src_root):
-        rel = src.relative_to(src_root)
-        dst = dst_root / rel
-        # Determine actual source (handle link: header)
-        actual_src, extra_lines, is_link = _extract_headers_and_target(src)
-        if extra_lines:
-            for line in extra_lines:
-                logger.info("[ovum-spotlight] user_plugins.default header: %s :: %s", rel.as_posix(), line)
-        if is_link:
-            # Resolve link target relative to the file it was found in
-            abs_target = actual_src if actual_src.is_absolute() else (src.parent / actual_src).resolve()
-            # Read content from actual file and apply replacements
-            if not abs_target.exists():
-                logger.warning("[ovum-spotlight] Linked source not found for %s: %s", rel, abs_target)
-                # Fall back to copying original if available
-                _copy_file_with_compare(src, dst)
-                continue
-            try:
-                content = _read_text_any(abs_target)
-            except Exception as e:
-                logger.warning("[ovum-spotlight] Failed to read linked source %s for %s: %s", abs_target, rel, e)
-                # Fall back to copying original if available
-                _copy_file_with_compare(src, dst)
-                continue
-            transformed = _apply_replacements(content, LINK_CONTENT_REPLACEMENTS)
-            dst.parent.mkdir(parents=True, exist_ok=True)
-            try:
-                prev = dst.read_text(encoding='utf-8') if dst.exists() else None
-            except Exception:
-                prev = dst.read_text() if dst.exists() else None
-            if prev == transformed:
-                continue
-            _write_text_any(dst, transformed)
-        else:
+def _process_one(src: Path, src_root: Path, dst_root: Path, recorded: Manifest, updated: Manifest,
+                 rules_digest: str) -> None:
+    """
+    Copy one default file (or its link: target) into dst_root; its directory must already exist.
+    Skipped without opening any file when its entry in recorded still matches by stat() (the
+    source, or for a link the link file and its target, plus dst and the replacement rules as
+    rules_digest); the signature after copying is stored in updated. Fallback copies of links
+    whose target can't be read are not recorded, so they are retried on every run.
+    """
+    rel = src.relative_to(src_root)
+    dst = dst_root / rel
+    key = rel.as_posix()
+    entry = recorded.get(key)
+    if entry and _unchanged(entry, src, dst, rules_digest):
+        updated[key] = entry
+        return
+    # Determine actual source (handle link: header)
+    actual_src, extra_lines, is_link = _extract_headers_and_target(src)
+    if extra_lines:
+        for line in extra_lines:
+            logger.info("[ovum-spotlight] user_plugins.default header: %s :: %s", rel.as_posix(), line)
+    if is_link:
+        # Resolve link target relative to the file it was found in
+        abs_target = actual_src if actual_src.is_absolute() else (src.parent / actual_src).resolve()
+        # Read content from actual file and apply replacements
+        if not abs_target.exists():
+            logger.warning("[ovum-spotlight] Linked source not found for %s: %s", rel, abs_target)
+            # Fall back to copying original if available
+            _copy_file_with_compare(src, dst)
+            return
+        try:
+            content = _read_text_any(abs_target)
+        except Exception as e:
+            logger.warning("[ovum-spotlight] Failed to read linked source %s for %s: %s", abs_target, rel, e)
+            # Fall back to copying original if available
             _copy_file_with_compare(src, dst)
+            return
+        transformed = _apply_replacements(content, LINK_CONTENT_REPLACEMENTS)
+        try:
+            prev = dst.read_text(encoding='utf-8') if dst.exists() else None
+        except Exception:
+            prev = dst.read_text() if dst.exists() else None
+        if prev != transformed:
+            _write_text_any(dst, transformed)
+        updated[key] = _link_signature(src, abs_target, dst, rules_digest)
+    else:
+        _copy_file_with_compare(src, dst)
+        updated[key] = _copy_signature(src, dst)
+
+
+# Copying is I/O-bound, so use more threads than cores
+COPY_WORKERS = min(32, (os.cpu_count() or 1) * 4)
+
+
+def _copy_tree_with_links(src_root: Path, dst_root: Path) -> None:
+    sources = list(_iter_files(src_root))
+    # Create each destination directory once, up front, rather than per file from the workers
+    for d in sorted({(dst_root / src.relative_to(src_root)).parent for src in sources}):
+        d.mkdir(parents=True, exist_ok=True)
+    recorded = _load_manifest(dst_root)
+    updated: Manifest = {}
+    rules_digest = _replacements_digest(LINK_CONTENT_REPLACEMENTS)
+    with ThreadPoolExecutor(max_workers=COPY_WORKERS, thread_name_prefix="ovum-spotlight-copy") as ex:
+        list(ex.map(lambda src: _process_one(src, src_root, dst_root, recorded, updated, rules_digest), sources))
+    # Written once per run, and only when something changed
+    if updated != recorded:
+        _save_manifest(dst_root, updated)
 
 
 def ensure_user_plugins_initialized() -> Path:
@@ -181,7 +321,7 @@ def ensure_user_plugins_initialized() -> Path:
 
     Returns the absolute Path to the user_plugins directory.
     """
-    user_base = Path(folder_paths.get_user_directory()).resolve() / 'spotlight' / 'user_plugins'
+    user_base = _user_directory() / 'spotlight' / 'user_plugins'
     _ensure_dirs(user_base)
 
     # Copy defaults if source exists alongside this module
@@ -197,8 +337,13 @@ def ensure_user_plugins_initialized() -> Path:
     return user_base
 
 
-# Execute on import, but swallow errors so extension still loads
-try:  # pragma: no cover
-    ensure_user_plugins_initialized()
-except Exception as _e:
-    logger.warning("[ovum-spotlight] setup_user_plugins initialization failed: %s", _e)
+def _initialize_in_background() -> None:
+    try:
+        ensure_user_plugins_initialized()
+    except Exception as e:
+        logger.warning("[ovum-spotlight] setup_user_plugins initialization failed: %s", e)
+
+
+# Execute on import, in a background thread so ComfyUI startup doesn't wait on the copy;
+# errors are swallowed so extension still loads
+threading.Thread(target=_initialize_in_background, name="ovum-spotlight-user-plugins", daemon=True).start()
@@ -1,75 +1,132 @@
 from __future__ import annotations
 
-import json
+import asyncio
+import functools
 import logging
 import os
 from pathlib import Path
-from typing import Iterable, List, Dict
+from typing import Iterable, List, Dict, Tuple
 
 # noinspection PyPackageRequirements
 from aiohttp import web
 # noinspection PyUnresolvedReferences,PyPackageRequirements
 from server import PromptServer
 
-logger = logging.getLogger(__name__)
-
-try:
-    # Prefer ComfyUI's real folder_paths if available
-    import folder_paths  # type: ignore
-except Exception:  # pragma: no cover - fallback for dev environments
-    logger.warning("[ovum-spotlight] folder_paths not found, using cwd fallback for user directory")
-
-    class _FolderPaths:
-        @staticmethod
-        def get_user_directory() -> str:
-            # Default to a .comfy directory under CWD for dev
-            return os.path.abspath(os.path.join(os.getcwd(), "user"))
+from _http_common import FILE_CHUNK_SIZE, json_bytes, safe_join
 
-    folder_paths = _FolderPaths()  # type: ignore
-
-
-# Compute base directory for Spotlight user plugins
-USER_PLUGINS_DIR = Path(folder_paths.get_user_directory()).resolve() / "spotlight" / "user_plugins"
+logger = logging.getLogger(__name__)
 
 
-def _is_subpath(child: Path, parent: Path) -> bool:
+@functools.cache
+def _user_plugins_dir() -> Path:
+    """
+    Base directory for Spotlight user plugins. Resolved (and folder_paths imported) on
+    first use rather than at module import.
+    """
     try:
-        child.resolve().relative_to(parent.resolve())
-        return True
-    except Exception:
-        return False
+        # Prefer ComfyUI's real folder_paths if available
+        import folder_paths  # type: ignore
+        user_dir = folder_paths.get_user_directory()
+    except Exception:  # pragma: no cover - fallback for dev environments
+        logger.warning("[ovum-spotlight] folder_paths not found, using cwd fallback for user directory")
+        # Default to a .comfy directory under CWD for dev
+        user_dir = os.path.abspath(os.path.join(os.getcwd(), "user"))
+    return (Path(user_dir) / "spotlight" / "user_plugins").resolve()
 
 
-def _walk_js_files(root: Path) -> Iterable[Path]:
+def _walk_js_files(root: Path) -> Iterable[str]:
     """
-    Recursively yield .js files under root, excluding any file or directory
-    that starts with '.' or '_'.
+    Recursively yield paths (as str) of .js files under root, excluding any file or
+    directory that starts with '.' or '_'. Uses os.scandir so the file type comes from
+    the directory entry rather than a separate stat() per entry.
     """
     if not root.exists():
         return []
-    stack = [root]
+    stack = [str(root)]
     while stack:
         d = stack.pop()
         try:
-            for entry in d.iterdir():
-                name = entry.name
-                if name.startswith('.') or name.startswith('_'):
-                    continue
-                if entry.is_dir():
-                    stack.append(entry)
-                elif entry.is_file() and entry.suffix.lower() == '.js':
-                    yield entry
+            with os.scandir(d) as it:
+                for entry in it:
+                    name = entry.name
+                    if name[:1] in ('.', '_'):
+                        continue
+                    if entry.is_dir(follow_symlinks=False):
+                        stack.append(entry.path)
+                    elif name[-3:].lower() == '.js' and entry.is_file(follow_symlinks=False):
+                        yield entry.path
         except Exception as e:
             logger.warning("[ovum-spotlight] Error reading directory %s: %s", d, e)
 
 
-def _relative_posix(path: Path, base: Path) -> str:
-    rel = path.resolve().relative_to(base.resolve())
-    return "/".join(rel.parts)
+def _relative_posix(path: str, base: str) -> str:
+    # base must already be resolved; resolving it here would cost a realpath per file
+    return os.path.relpath(path, base).replace(os.sep, "/")
+
+
+def _tree_mtime_ns(root: Path) -> int:
+    """
+    Newest st_mtime_ns of root and every directory below it (skipping '.'/'_' entries).
+    Adding, removing or renaming a file bumps its parent directory's mtime, so this value
+    changes whenever the .js listing of root could change.
+    """
+    latest = 0
+    stack = [str(root)]
+    while stack:
+        d = stack.pop()
+        try:
+            latest = max(latest, os.stat(d).st_mtime_ns)
+            with os.scandir(d) as it:
+                for entry in it:
+                    if entry.name[:1] in ('.', '_'):
+                        continue
+                    if entry.is_dir(follow_symlinks=False):
+                        stack.append(entry.path)
+        except OSError:
+            continue
+    return latest
 
 
 API_BASE = "/spotlight/user_plugins"
 
+# Encoded directory listings keyed by directory: {target: (tree_mtime_ns, json_body)}
+_LISTING_CACHE: Dict[Path, Tuple[int, bytes]] = {}
+
+
+def _build_listing(root: Path) -> bytes:
+    base = str(_user_plugins_dir())
+    api_slash = API_BASE + "/"
+    files: List[Dict[str, str]] = []
+    for f in _walk_js_files(root):
+        rel = _relative_posix(f, base)
+        files.append({
+            "path": rel,
+            "url": api_slash + rel,
+        })
+    return json_bytes({"base": API_BASE, "files": files})
+
+
+async def _listing_response(request: web.Request, root: Path) -> web.Response:
+    """
+    Returns the JSON listing for root, rebuilding it only when the directory tree has changed
+    since the cached copy. Honors If-None-Match with a 304. Both the tree check (a scandir of
+    every directory) and any rebuild run off the event loop.
+    """
+    key = await asyncio.to_thread(_tree_mtime_ns, root)
+    token = f"{key:x}"
+    etag = f'"{token}"'
+    # request.if_none_match is aiohttp's parse of the header, so lists, W/ weak tags and "*"
+    # match here as they do for FileResponse in _mini_webserver.py
+    if any(tag.value in (token, "*") for tag in request.if_none_match or ()):
+        return web.Response(status=304, headers={"ETag": etag})
+    cached = _LISTING_CACHE.get(root)
+    if cached is not None and cached[0] == key:
+        body = cached[1]
+    else:
+        body = await asyncio.to_thread(_build_listing, root)
+        _LISTING_CACHE[root] = (key, body)
+    return web.Response(body=body, content_type="application/json", headers={"ETag": etag})
+
 
 @PromptServer.instance.routes.get(f"{API_BASE}/{{tail:.*}}")
 async def spotlight_user_plugins(request: web.Request):
@@ -82,26 +139,16 @@ async def spotlight_user_plugins(request: web.Request):
     {"base": "/ovum-spotlight/user_plugins", "files": [{"path": "samples/keywords/foo.js", "url": "/ovum-spotlight/user_plugins/samples/keywords/foo.js"}, ...]}
     """
     tail = request.match_info.get("tail", "").strip()
-    # Normalize tail to a safe relative Path (prevent traversal)
-    safe_tail = Path(*(p for p in Path(tail).parts if p not in ("..", "")))
-    target = (USER_PLUGINS_DIR / safe_tail).resolve()
-
-    # Enforce sandbox under USER_PLUGINS_DIR
-    if not _is_subpath(target, USER_PLUGINS_DIR):
+    root = _user_plugins_dir()
+    # Enforce sandbox under the user plugins directory: no traversal, no symlinks out of it
+    target = safe_join(root, tail)
+    if target is None:
         return web.Response(status=403, text="Forbidden")
 
     # If directory → return recursive listing
     if target.is_dir():
         try:
-            files: List[Dict[str, str]] = []
-            for f in _walk_js_files(target):
-                rel = _relative_posix(f, USER_PLUGINS_DIR)
-                files.append({
-                    "path": rel,
-                    "url": f"{API_BASE}/{rel}",
-                })
-            body = json.dumps({"base": API_BASE, "files": files})
-            return web.Response(text=body, content_type="application/json")
+            return await _listing_response(request, target)
         except Exception as e:
             logger.exception("[ovum-spotlight] Failed to list user plugins: %s", e)
             return web.json_response({"error": True, "message": str(e)}, status=500)
@@ -112,7 +159,7 @@ async def spotlight_user_plugins(request: web.Request):
         if target.suffix.lower() != ".js":
             return web.Response(status=403, text="Forbidden: only .js allowed")
         try:
-            return web.FileResponse(path=target)
+            return web.FileResponse(path=target, chunk_size=FILE_CHUNK_SIZE)
         except Exception as e:
             logger.exception("[ovum-spotlight] Failed to serve user plugin %s: %s", target, e)
             return web.Response(status=500, text="Internal Server Error")
@@ -120,13 +167,7 @@ async def spotlight_user_plugins(request: web.Request):
     # If tail empty but path doesn't exist yet, treat as directory listing of root
     if tail == "":
         try:
-            files = []
-            if USER_PLUGINS_DIR.exists():
-                for f in _walk_js_files(USER_PLUGINS_DIR):
-                    rel = _relative_posix(f, USER_PLUGINS_DIR)
-                    files.append({"path": rel, "url": f"{API_BASE}/{rel}"})
-            body = json.dumps({"base": API_BASE, "files": files})
-            return web.Response(text=body, content_type="application/json")
+            return await _listing_response(request, root)
         except Exception as e:
             logger.exception("[ovum-spotlight] Failed to list root user plugins: %s", e)
             return web.json_response({"error": True, "message": str(e)}, status=500)
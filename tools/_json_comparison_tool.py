@@ -1,54 +1,216 @@
 # Python
 import json
+import mmap
+import sys
 from pathlib import Path
-from typing import Any
+from typing import Any, List, Optional
+
+try:
+    import orjson
+except ImportError:  # stdlib fallback
+    orjson = None
+
+try:
+    import msgspec
+except ImportError:
+    msgspec = None
+
+
+def _msgspec_then_orjson(buf) -> Any:
+    try:
+        return msgspec.json.decode(buf)
+    except RecursionError:
+        if orjson is None:
+            raise
+        # orjson parses nesting far past the interpreter's recursion limit, and compare()
+        # handles any depth
+        return orjson.loads(buf)
+
+
+# Parser that takes raw bytes (or any buffer); None means stdlib json. msgspec is preferred
+# because it keeps integers wider than 64 bits exact, where orjson turns them into floats.
+# Documents have no fixed schema, so msgspec decodes to plain dicts and lists like the others.
+if msgspec is not None:
+    _loads = _msgspec_then_orjson
+elif orjson is not None:
+    _loads = orjson.loads
+else:
+    _loads = None
 
 LEFT = Path(r"C:\Users\sfink\AppData\Roaming\JetBrains\PyCharm2025.2\scratches\scratch_42.txt")
 RIGHT = Path(r"C:\Users\sfink\AppData\Roaming\JetBrains\PyCharm2025.2\scratches\scratch_43.txt")
 
+# Inputs larger than this are memory-mapped rather than read into a bytes object
+MMAP_THRESHOLD = 1 << 20
+
+
 def load_json(path: Path) -> Any:
+    if _loads is not None:
+        if path.stat().st_size > MMAP_THRESHOLD:
+            # Parse straight from the mapping: pages are faulted in as the parser reads them
+            # and no full-size copy of the file is held alongside the parsed result
+            with path.open("rb") as f, mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) as mm:
+                view = memoryview(mm)
+                try:
+                    return _loads(view)
+                finally:
+                    view.release()
+        # Parse the raw bytes directly, skipping the decode to str
+        return _loads(path.read_bytes())
     with path.open("r", encoding="utf-8") as f:
         return json.load(f)
 
-def compare(a: Any, b: Any, prefix: str = "", include_missing: bool = False):
-    if type(a) != type(b):
-        print(f"{prefix}: {a!r} -> {b!r}")
-        return
-
-    if isinstance(a, dict):
-        keys = set(a.keys()) | set(b.keys())
-        for k in sorted(keys):
-            in_a, in_b = k in a, k in b
-            key_path = f"{prefix}.{k}" if prefix else k
-            if in_a and in_b:
-                compare(a[k], b[k], key_path, include_missing)
-            elif include_missing:
-                side = "missing-left" if not in_a else "missing-right"
-                val = b[k] if in_a is False else a[k]
-                print(f"{key_path}: {side} {val!r}")
-        return
-
-    if isinstance(a, list):
-        max_len = max(len(a), len(b))
-        for i in range(max_len):
-            idx_path = f"{prefix}[{i}]"
-            if i >= len(a) or i >= len(b):
-                if include_missing:
-                    side = "missing-left" if i >= len(a) else "missing-right"
-                    val = b[i] if i < len(b) else a[i]
-                    print(f"{idx_path}: {side} {val!r}")
-                continue
-            compare(a[i], b[i], idx_path, include_missing)
-        return
-
-    # Primitive values
-    if a != b:
-        print(f"{prefix}: {a!r} -> {b!r}")
+
+def _canonical(value: Any):
+    if orjson is not None:
+        try:
+            return orjson.dumps(value, option=orjson.OPT_SORT_KEYS)
+        except TypeError:
+            # e.g. integers beyond 64 bits, which msgspec and json can parse but orjson can't
+            # emit, or nesting deeper than orjson's fixed limit
+            pass
+    return json.dumps(value, sort_keys=True)
+
+
+def _equal_subtree(a: Any, b: Any) -> bool:
+    """
+    a == b, but without treating 1, 1.0 and True as interchangeable inside containers, since
+    compare() reports those as differences. Only subtrees that are already == get serialized.
+    Both == and the serializers recurse in C, so a subtree nested past the interpreter's
+    recursion limit reports False here and compare() walks it on its own stack instead.
+    """
+    try:
+        if a != b:
+            return False
+        if isinstance(a, (dict, list)):
+            return _canonical(a) == _canonical(b)
+    except RecursionError:
+        return False
+    return True
+
+
+# Stands in for the absent side of a key or index that only one document has
+_MISSING = object()
+
+
+def _fmt_path(path) -> str:
+    """
+    Render a path for output: the root prefix string, or a (parent, key) link onto it. An int
+    key is a list index (JSON object keys are always strings) and renders as [i].
+    """
+    keys = []
+    while type(path) is tuple:
+        path, key = path
+        keys.append(key)
+    for key in reversed(keys):
+        if type(key) is int:
+            path = f"{path}[{key}]"
+        else:
+            path = f"{path}.{key}" if path else key
+    return path
+
+
+def _cmp_dict(a: dict, b: dict, path, include_missing: bool, emit) -> list:
+    """
+    The (a, b, path) children of two dicts, in the left document's key order followed (with
+    include_missing) by the right-only keys, sorted; no per-node key sets or full sort needed.
+    """
+    children = []
+    for k, va in a.items():
+        vb = b.get(k, _MISSING)
+        if vb is not _MISSING or include_missing:
+            children.append((va, vb, (path, k)))
+    if include_missing:
+        for k in sorted(b.keys() - a.keys()):
+            children.append((_MISSING, b[k], (path, k)))
+    return children
+
+
+def _cmp_list(a: list, b: list, path, include_missing: bool, emit) -> list:
+    """
+    The (a, b, path) children of two lists, index by index. Lists holding only scalars are
+    diffed right here in one flat loop, emitting directly, and yield no children at all.
+    """
+    if not any(type(x) in _HANDLERS for x in a) and not any(type(y) in _HANDLERS for y in b):
+        # Only reached for lists that differ, so the prefix is rendered once up front
+        prefix = _fmt_path(path)
+        # Same report as the per-element walk: a type change (1 vs 1.0 vs True) is a difference
+        for i, (x, y) in enumerate(zip(a, b)):
+            if x != y or type(x) is not type(y):
+                emit(f"{prefix}[{i}]: {x!r} -> {y!r}")
+        if include_missing and len(a) != len(b):
+            longer, side = (a, "missing-right") if len(a) > len(b) else (b, "missing-left")
+            n = min(len(a), len(b))
+            for i, val in enumerate(longer[n:], n):
+                emit(f"{prefix}[{i}]: {side} {val!r}")
+        return []
+
+    children = []
+    for i in range(max(len(a), len(b))):
+        if i >= len(a) or i >= len(b):
+            if include_missing:
+                children.append((a[i] if i < len(a) else _MISSING, b[i] if i < len(b) else _MISSING, (path, i)))
+            continue
+        children.append((a[i], b[i], (path, i)))
+    return children
+
+
+# Container types keyed by exact type: one dict lookup per node instead of isinstance checks.
+# JSON parsers only produce plain dicts and lists, so subclasses need no handling.
+_HANDLERS = {dict: _cmp_dict, list: _cmp_list}
+
+
+def compare(a: Any, b: Any, prefix: str = "", include_missing: bool = False,
+            out: Optional[List[str]] = None) -> List[str]:
+    """
+    Collects one line per difference into out (a new list by default) and returns it; lines
+    are buffered rather than printed so a large diff costs one write instead of one per line.
+    """
+    if out is None:
+        out = []
+    emit = out.append
+    # Depth-first walk on an explicit stack: no Python frame per node and no recursion
+    # limit (the equal-subtree shortcut below recurses, but gives up rather than fail on
+    # input too deep for it). Children are pushed in reverse so they pop (and report) in document order.
+    # Paths travel as (parent, key) links and are only rendered to text when a line is
+    # emitted, so descending into a subtree that turns out equal builds no strings.
+    stack = [(a, b, prefix)]
+    while stack:
+        a, b, path = stack.pop()
+        if a is _MISSING or b is _MISSING:
+            side = "missing-left" if a is _MISSING else "missing-right"
+            val = b if a is _MISSING else a
+            emit(f"{_fmt_path(path)}: {side} {val!r}")
+            continue
+
+        if type(a) != type(b):
+            emit(f"{_fmt_path(path)}: {a!r} -> {b!r}")
+            continue
+
+        # Identical or equal subtrees hold no differences, and dict/list == runs in C, settling
+        # a whole subtree in one call. This holds with include_missing too: equal dicts have
+        # the same keys and equal lists the same length, so nothing could be missing.
+        if a is b or _equal_subtree(a, b):
+            continue
+
+        handler = _HANDLERS.get(type(a))
+        if handler is not None:
+            stack.extend(reversed(handler(a, b, path, include_missing, emit)))
+            continue
+
+        # Primitive values
+        if a != b:
+            emit(f"{_fmt_path(path)}: {a!r} -> {b!r}")
+
+    return out
 
 def main():
     left = load_json(LEFT)
     right = load_json(RIGHT)
-    compare(left, right, include_missing=False)
+    out = compare(left, right, include_missing=False)
+    if out:
+        sys.stdout.write("\n".join(out))
+        sys.stdout.write("\n")
 
 if __name__ == "__main__":
     main()
@@ -1,45 +1,63 @@
+import functools
+import mmap
 import re
 from pathlib import Path
+from typing import Optional
 
 # Single target: ovum-spotlight
 PROJECT_FILE = Path("pyproject.toml")
 
-VERSION_RE = re.compile(r'^(version\s*=\s*[\"\'])(\d+)\.(\d+)\.(\d+)([\"\'])\s*$', re.IGNORECASE)
+# Matches the whole version line, indentation included, within the full file (MULTILINE); only
+# the patch number is captured, since that is all either bump path rewrites.
+# Every run of blanks, including those around '=', is [ \t] rather than \s so a match never
+# spills onto neighbouring lines, and a CR before the line end is allowed for CRLF files.
+# Case-sensitive, as TOML keys are: only `version` is the project version key.
+VERSION_PATTERN = r'^[ \t]*version[ \t]*=[ \t]*[\"\']\d+\.\d+\.(?P<patch>\d+)[\"\'][ \t]*\r?$'
 
 
-def bump_patch(match):
-    prefix, major, minor, patch, suffix = match.groups()
-    try:
-        p = int(patch) + 1
-        return f"{prefix}{int(major)}.{int(minor)}.{p}{suffix}"
-    except Exception:
-        return match.group(0)
+@functools.lru_cache(maxsize=None)
+def _version_re() -> re.Pattern:
+    """VERSION_PATTERN compiled once, against raw file bytes."""
+    return re.compile(VERSION_PATTERN.encode("ascii"), re.MULTILINE)
+
+
+def _patch_in_place(path: Path) -> Optional[bool]:
+    """
+    Bump the patch number directly in the memory-mapped file when the new number has as many
+    digits as the old one (1.0.144 -> 1.0.145), leaving every other byte untouched. Returns
+    None when the digit count grows (1.0.99 -> 1.0.100) and the file must be rewritten.
+    """
+    if path.stat().st_size == 0:
+        return False
+    with path.open("r+b") as f, mmap.mmap(f.fileno(), 0) as mm:
+        m = _version_re().search(mm)
+        if not m:
+            return False
+        old = m.group("patch")
+        new = str(int(old) + 1).encode("ascii")
+        if len(new) != len(old):
+            return None
+        mm[m.start("patch"):m.end("patch")] = new
+        mm.flush()
+        return True
 
 
 def process_file(path: Path) -> bool:
     if not path.exists():
         return False
-    changed = False
-    lines = path.read_text(encoding="utf-8").splitlines()
-    new_lines = []
-    for line in lines:
-        if changed:
-            new_lines.append(line)
-            continue
-        m = VERSION_RE.match(line.strip())
-        if m:
-            indent = line[: len(line) - len(line.lstrip(" \t"))]
-            new_line = indent + bump_patch(m)
-            if new_line != line:
-                changed = True
-                new_lines.append(new_line)
-            else:
-                new_lines.append(line)
-        else:
-            new_lines.append(line)
-    if changed:
-        path.write_text("\n".join(new_lines) + "\n", encoding="utf-8")
-    return changed
+    patched = _patch_in_place(path)
+    if patched is not None:
+        return patched
+    # pyproject.toml is ASCII where it matters, so work on the raw bytes and skip the UTF-8
+    # decode/encode round-trip; splicing in just the new patch digits keeps everything else
+    # (line endings, trailing blanks) byte-for-byte
+    data = path.read_bytes()
+    m = _version_re().search(data)
+    if not m:
+        return False
+    patch = str(int(m.group("patch")) + 1).encode("ascii")
+    path.write_bytes(data[:m.start("patch")] + patch + data[m.end("patch"):])
+    return True
 
 
 def main() -> int:
@@ -0,0 +1,80 @@
+"""
+Generate _node_manifest.py: the modules the package __init__ imports and the nodes each one
+registers, so package import needs neither a directory scan nor per-module reflection.
+
+Each module is probed in its own subprocess, so run this from an environment where ComfyUI
+(comfy, server, folder_paths) is importable. Re-run it whenever a top-level module is added,
+removed or renamed, or a node's class list or display name changes.
+"""
+import json
+import subprocess
+import sys
+from pathlib import Path
+
+ROOT = Path(__file__).resolve().parent.parent
+MANIFEST = ROOT / "_node_manifest.py"
+
+# Mirrors the registration logic in __init__.py; prints [[node_name, display_name|None], ...]
+PROBE = r"""
+import importlib
+import json
+import sys
+
+sys.path.insert(0, sys.argv[1])
+module = importlib.import_module(sys.argv[2])
+nodes = []
+if 'CLAZZES' in module.__dict__:
+    for clazz in module.CLAZZES:
+        display_name = getattr(clazz, "NAME", None)
+        nodes.append([clazz.__name__, display_name if isinstance(display_name, str) and display_name.strip() else None])
+elif 'CLASS_MAPPINGS' in module.__dict__ and 'CLASS_NAMES' in module.__dict__:
+    for name in module.CLASS_MAPPINGS:
+        nodes.append([name, module.CLASS_NAMES.get(name) or None])
+print(json.dumps(nodes))
+"""
+
+
+def discover_modules(root: Path) -> list:
+    return sorted(p.stem for p in root.glob("*.py") if not p.name.startswith("_"))
+
+
+def probe(root: Path, module: str) -> list:
+    result = subprocess.run(
+        [sys.executable, "-c", PROBE, str(root), module],
+        capture_output=True, text=True, check=True, cwd=root,
+    )
+    # Modules may print on import; the probe's JSON is always the last line
+    return json.loads(result.stdout.strip().splitlines()[-1])
+
+
+def render(modules: list, nodes: list) -> str:
+    lines = [
+        "# Generated by tools/build_manifest.py -- do not edit by hand.",
+        "# MODULES: imported in order by __init__.py.",
+        "# NODE_MANIFEST: (module, node_name, display_name); a display_name of None means pretty(node_name).",
+        "",
+        "MODULES = (",
+        *(f"    {m!r}," for m in modules),
+        ")",
+        "",
+        "NODE_MANIFEST = (",
+        *(f"    {tuple(n)!r}," for n in nodes),
+        ")",
+        "",
+    ]
+    return "\n".join(lines)
+
+
+def main() -> int:
+    modules = discover_modules(ROOT)
+    nodes = []
+    for module in modules:
+        for name, display_name in probe(ROOT, module):
+            nodes.append((module, name, display_name))
+    MANIFEST.write_text(render(modules, nodes), encoding="utf-8")
+    print(f"FILE={MANIFEST}")
+    return 0
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())